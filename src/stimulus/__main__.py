@@ -11,6 +11,10 @@ from .generators import (
 from .providers.docstrings import FolderBasedDocstringProvider
 from .version import __version__
 
+#: Size of the write buffer used for output files. Code generators emit lots
+#: of small strings so we use a buffer that is larger than the default one
+OUTPUT_BUFFER_SIZE = 1024 * 1024
+
 
 def create_argument_parser() -> ArgumentParser:
     parser = ArgumentParser()
@@ -64,6 +68,15 @@ def create_argument_parser() -> ArgumentParser:
         default=[],
     )
 
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        metavar="N",
+        type=int,
+        help="generate functions in N worker processes where supported",
+        default=1,
+    )
+
     parser.add_argument(
         "-D",
         "--docstring-dir",
@@ -125,6 +138,7 @@ def main():
 
         generator = factory()
         generator.use_logger(log)
+        generator.use_worker_processes(options.jobs)
         for path in function_files:
             generator.load_function_descriptors_from_file(path)
         for path in type_files:
@@ -138,7 +152,9 @@ def main():
             generator.generate(inputs, sys.stdout)
         else:
             try:
-                with open(output, "w") as fp:
+                with open(
+                    output, "w", buffering=OUTPUT_BUFFER_SIZE, encoding="utf-8"
+                ) as fp:
                     generator.generate(inputs, fp)
             except Exception:
                 # An error happened; delete the file and re-raise the exception
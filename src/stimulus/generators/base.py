@@ -2,10 +2,13 @@ import re
 
 from abc import abstractmethod, ABCMeta
 from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
 from io import StringIO
-from logging import Logger
+from logging import Logger, LogRecord, getLogger
+from logging.handlers import QueueHandler
 from pathlib import Path
+from queue import SimpleQueue
 from shutil import copyfileobj
 from typing import (
     Any,
@@ -13,13 +16,13 @@ from typing import (
     IO,
     Iterable,
     List,
+    Optional,
     Sequence,
     Tuple,
 )
 
 from stimulus.errors import CodeGenerationError, NoSuchTypeError
 from stimulus.model import DocstringProvider, FunctionDescriptor, TypeDescriptor
-from stimulus.utils import constant
 
 __all__ = (
     "BlockBasedCodeGenerator",
@@ -101,6 +104,56 @@ class CodeGenerator(metaclass=ABCMeta):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def use_worker_processes(self, num_workers: int) -> None:
+        """Instructs the code generator to distribute the generation of
+        functions among the given number of worker processes if it supports
+        doing so.
+        """
+        raise NotImplementedError
+
+
+#: Minimum number of functions to generate for which it is worth starting
+#: worker processes
+_MIN_FUNCTIONS_FOR_WORKERS = 32
+
+#: Code generator used by the current worker process
+_worker_generator: Optional["CodeGeneratorBase"] = None
+
+#: Queue collecting the log records of the current worker process
+_worker_log_queue: "SimpleQueue[LogRecord]" = SimpleQueue()
+
+
+def _init_worker(generator: "CodeGeneratorBase", log_level: Optional[int]) -> None:
+    global _worker_generator
+    _worker_generator = generator
+
+    # Worker processes may not inherit the logging configuration of the
+    # parent process so the log records are collected here and handed back
+    # to the parent process together with the generated code
+    if log_level is not None:
+        log = getLogger(f"{__name__}.worker")
+        log.handlers[:] = [QueueHandler(_worker_log_queue)]
+        log.propagate = False
+        log.setLevel(log_level)
+        generator.use_logger(log)
+
+
+def _generate_function_in_worker(name: str) -> Tuple[str, List[LogRecord]]:
+    assert _worker_generator is not None
+    buf = StringIO()
+    _worker_generator.generate_function(name, buf)
+
+    records = []
+    while not _worker_log_queue.empty():
+        records.append(_worker_log_queue.get_nowait())
+
+    return buf.getvalue(), records
+
+
+def _no_docstring(name: str) -> None:
+    return None
+
 
 def _nop(*args, **kwds) -> None:
     pass
@@ -117,11 +170,21 @@ class CodeGeneratorBase(CodeGenerator):
     log: Logger
     name: str
 
+    generates_functions_independently: bool = False
+    """Whether `generate_function()` leaves the code generator and its function
+    and type descriptors unchanged, apart from filling caches, so the functions
+    can be generated in worker processes whose changes are discarded.
+    """
+
+    num_workers: int
+    """Number of worker processes to use for generating functions."""
+
     _docstring_provider: DocstringProvider
     _function_descriptors: Dict[str, FunctionDescriptor]
     _type_descriptors: Dict[str, TypeDescriptor]
 
     _deps_cache: Dict[str, Dict[str, Tuple[str, ...]]]
+    _function_cache: Dict[str, str]
     _ignore_cache: Dict[str, bool]
 
     def __init__(self):
@@ -135,11 +198,14 @@ class CodeGeneratorBase(CodeGenerator):
 
         self.log = _DummyLogger()  # type: ignore
 
-        self._docstring_provider = constant(None)
+        self.num_workers = 1
+
+        self._docstring_provider = _no_docstring
         self._function_descriptors = OrderedDict()
         self._type_descriptors = {}
 
         self._deps_cache = {}
+        self._function_cache = {}
         self._ignore_cache = {}
 
     def check_types_of_function(self, function: str, errors: str = "raise") -> bool:
@@ -191,6 +257,7 @@ class CodeGeneratorBase(CodeGenerator):
             descriptor = self.get_or_create_function_descriptor(name)
             if spec is not None:
                 descriptor.update_from(spec)
+        self._function_cache.clear()
 
     def load_type_descriptors_from_file(self, filename: str) -> None:
         specs = self._parse_file(filename)
@@ -201,13 +268,18 @@ class CodeGeneratorBase(CodeGenerator):
             descriptor = self.get_or_create_type_descriptor(name)
             if spec is not None:
                 descriptor.update_from(spec)
+        self._function_cache.clear()
 
     def use_docstring_provider(self, provider: DocstringProvider) -> None:
         self.docstring_provider = provider
+        self._function_cache.clear()
 
     def use_logger(self, log: Logger) -> None:
         self.log = log
 
+    def use_worker_processes(self, num_workers: int) -> None:
+        self.num_workers = max(num_workers, 1)
+
     def get_function_descriptor(self, name: str) -> FunctionDescriptor:
         return self._function_descriptors[name]
 
@@ -244,9 +316,52 @@ class CodeGeneratorBase(CodeGenerator):
     def generate_functions_block(self, output: IO[str]) -> None:
         """Generates the part of the output file that contains the generated code
         for functions.
+
+        Functions are generated in worker processes if the code generator
+        supports it, more than one worker process was requested and there are
+        enough functions to make it worthwhile. The order of the functions in
+        the output is the same in both cases.
+
+        When the code generator generates functions independently, the
+        generated code of each function is also cached until new function or
+        type descriptors are loaded so generating the same functions again
+        only writes the cached code.
         """
-        for name in self.iter_functions():
-            self.generate_function(name, output)
+        names = list(self.iter_functions())
+        if not self.generates_functions_independently:
+            for name in names:
+                self.generate_function(name, output)
+            return
+
+        cache = self._function_cache
+        missing = [name for name in names if name not in cache]
+        if self.num_workers > 1 and len(missing) > _MIN_FUNCTIONS_FOR_WORKERS:
+            chunksize = max(len(missing) // (self.num_workers * 4), 1)
+            log_level = (
+                self.log.getEffectiveLevel() if isinstance(self.log, Logger) else None
+            )
+            with ProcessPoolExecutor(
+                self.num_workers,
+                initializer=_init_worker,
+                initargs=(self, log_level),
+            ) as executor:
+                results = executor.map(
+                    _generate_function_in_worker, missing, chunksize=chunksize
+                )
+                # Results arrive in the order of the functions so the log
+                # records of the workers are handled in that order, too
+                for name, (text, records) in zip(missing, results):
+                    cache[name] = text
+                    for record in records:
+                        self.log.handle(record)
+        else:
+            for name in missing:
+                buf = StringIO()
+                self.generate_function(name, buf)
+                cache[name] = buf.getvalue()
+
+        for name in names:
+            output.write(cache[name])
 
     def iter_functions(self, include_ignored: bool = False) -> Iterable[str]:
         """Iterator that yields the names of the functions in the function
@@ -396,7 +511,14 @@ class SingleBlockCodeGenerator(CodeGeneratorBase):
 
     def generate(self, inputs: Sequence[str], output: IO[str]) -> None:
         self.generate_preamble(inputs, output)
-        self.generate_functions_block(output)
+
+        # Generate the functions into an in-memory buffer first so the output
+        # stream receives a single write even if it is unbuffered or
+        # line-buffered
+        buf = StringIO()
+        self.generate_functions_block(buf)
+        output.write(buf.getvalue())
+
         self.generate_epilogue(inputs, output)
 
     def generate_epilogue(self, inputs: Sequence[str], output: IO[str]) -> None:
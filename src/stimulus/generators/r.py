@@ -5,11 +5,22 @@ TODO: free memory when CTRL+C pressed, even on Windows
 
 import re
 
+from itertools import chain
 from shlex import quote
-from typing import Iterable, IO, Optional, Tuple
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    IO,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TYPE_CHECKING,
+)
 
-from stimulus.errors import NoSuchTypeError
-from stimulus.model import ParamMode, ParamSpec
+from stimulus.errors import CodeGenerationError, NoSuchTypeError
+from stimulus.model import ParamMode, ParamSpec, TypeDescriptor
 from stimulus.model.functions import FunctionDescriptor
 
 from .base import (
@@ -18,14 +29,212 @@ from .base import (
 )
 from .utils import create_indentation_function
 
+if TYPE_CHECKING:
+    from jinja2 import Template
+
 
 indent = create_indentation_function("  ")
 
+_PLACEHOLDER = re.compile(r"%([IC])([0-9]+|)%")
+_PLACEHOLDER_SUB = re.compile(r"%I[0-9]+%")
+_GATTR_PARAM_TOKEN = re.compile(r"[^,\s]+")
+
+_R_FUNCTION_TEMPLATE = """\
+{{ name }}_impl <- function({{ head|join(", ") }}) {
+  # Argument checks
+{% if has_dots_arg %}
+  check_dots_empty()
+{% endif %}
+{{ inconv|join("\\n") }}
+
+  on.exit( .Call(R_igraph_finalizer) )
+  # Function call
+  res <- .Call(R_{{ function }}, {{ call_args|join(", ") }})
+{{ outconv|join("\\n") }}
+{% if attr_lines %}
+  if (igraph_opt("add.params")) {
+{% for line in attr_lines %}
+    {{ line }}
+{% endfor %}
+  }
+
+{% endif %}
+{% if "CLASS" in r_spec %}
+  class(res) <- "{{ r_spec["CLASS"] }}"
+{% endif %}
+{% if "PP" in r_spec %}
+  res <- {{ r_spec["PP"] }}(res)
+{% endif %}
+  res
+}
+
+"""
+
+_r_function_template: Optional["Template"] = None
+
+_C_FUNCTION_TEMPLATE = """
+/*-------------------------------------------/
+/ {func:<42} /
+/-------------------------------------------*/
+{header} {{
+                                        /* Declarations */
+{decl}
+                                        /* Convert input */
+{inconv}
+                                        /* Call igraph */
+{call}
+                                        /* Convert output */
+{outconv}
+
+  UNPROTECT(1);
+  return(r_result);
+}}\n"""
+
 init_functions = {
     "igraph_vector_int_t": "IGRAPH_R_CHECK(igraph_vector_int_init(&%C%, 0));\nIGRAPH_FINALLY(igraph_vector_int_destroy, &%C%);"
 }
 
 
+def _expand(
+    template: str,
+    i_val: Optional[str],
+    c_val: Optional[str],
+    *,
+    i_deps: Sequence[str] = (),
+    c_deps: Sequence[str] = (),
+    c_deps_prefix: str = "",
+    expand_c: bool = True,
+) -> Tuple[str, int]:
+    """Replaces the ``%I%``, ``%C%``, ``%I1%``, ``%C1%`` etc. placeholders of
+    a template in a single pass.
+
+    ``%I%`` and ``%C%`` are replaced with `i_val` and `c_val`, ``%In%`` and
+    ``%Cn%`` are replaced with the n-th item of `i_deps` and `c_deps`, the
+    latter prefixed with `c_deps_prefix`. Placeholders that have no
+    corresponding value are left intact. When `expand_c` is `False` (e.g. in
+    the R layer, which has no C names), ``%C%`` and ``%Cn%`` placeholders are
+    not expanded at all.
+
+    Returns:
+        the expanded template and the number of placeholders of the expanded
+        kinds that were left intact because they had no corresponding value
+    """
+    if "%" not in template:
+        # Fast path: most conversion templates have no placeholders at all
+        return template, 0
+
+    missing = 0
+
+    def lookup(match: "re.Match[str]") -> str:
+        nonlocal missing
+        code, index = match.groups()
+        if code == "C" and not expand_c:
+            return match.group(0)
+        if index:
+            deps = i_deps if code == "I" else c_deps
+            pos = int(index) - 1
+            if 0 <= pos < len(deps):
+                value = deps[pos] if code == "I" else c_deps_prefix + deps[pos]
+            else:
+                value = None
+        else:
+            value = i_val if code == "I" else c_val
+        if value is None:
+            missing += 1
+            return match.group(0)
+        return value
+
+    return _PLACEHOLDER.sub(lookup, template), missing
+
+
+def _expand_c_conversion(template: str, param: ParamSpec) -> str:
+    """Indents a conversion template of the C glue code and replaces its
+    placeholders with the names of the R and C variables corresponding to the
+    given parameter and its dependencies.
+    """
+    if not template:
+        return ""
+
+    result, _ = _expand(
+        indent(template),
+        param.name,
+        f"c_{param.name}",
+        c_deps=param.dependencies,
+        c_deps_prefix="c_",
+    )
+    return result
+
+
+def _parse_graph_attributes(spec: FunctionDescriptor, gattrs: Any) -> Dict[str, str]:
+    """Parses the ``GATTR`` entry of the R namespace of a function, given
+    either as a mapping or as a comma-separated list of ``name IS value``
+    items.
+    """
+    if gattrs is None:
+        return {}
+    if isinstance(gattrs, dict):
+        return gattrs
+
+    gattrs_dict = {}
+    for item in gattrs.split(","):
+        attr_name, sep, value = item.partition(" IS ")
+        if not sep:
+            raise CodeGenerationError(
+                f"graph attribute of function {spec.name} must be given as "
+                f"'name IS value', got {item!r}"
+            )
+        gattrs_dict[attr_name.strip()] = value.strip()
+    return gattrs_dict
+
+
+def _parse_r_namespace(spec: FunctionDescriptor) -> Dict[str, Any]:
+    """Returns the R-specific part of the specification of a function, with
+    the graph attributes and the graph attribute parameters parsed.
+
+    ``GATTR`` is always a mapping and ``GATTR-PARAM`` is always a list of R
+    names in the result. The result is a new dictionary; the function
+    descriptor itself is left intact.
+    """
+    if "R" in spec:
+        r_spec = dict(spec["R"])
+    else:
+        # Convert legacy "GATTR-R", "GATTR-PARAM-R", "CLASS-R" and "PP-R"
+        r_spec = {}
+        for key in ("GATTR", "GATTR-PARAM", "CLASS", "PP"):
+            r_key = f"{key}-R"
+            if r_key in spec:
+                r_spec[key] = spec[r_key]
+
+    r_spec["GATTR"] = _parse_graph_attributes(spec, r_spec.get("GATTR"))
+
+    pars = r_spec.get("GATTR-PARAM") or ()
+    if isinstance(pars, str):
+        pars = _GATTR_PARAM_TOKEN.findall(pars)
+    r_spec["GATTR-PARAM"] = [par.strip().replace("_", ".") for par in pars]
+
+    return r_spec
+
+
+def _get_r_function_template() -> "Template":
+    """Returns the compiled Jinja2 template of R wrapper functions, compiling
+    it on first use.
+    """
+    global _r_function_template
+
+    if _r_function_template is None:
+        from jinja2 import Environment
+
+        env = Environment(
+            autoescape=False,
+            keep_trailing_newline=True,
+            lstrip_blocks=True,
+            trim_blocks=True,
+        )
+        _r_function_template = env.from_string(_R_FUNCTION_TEMPLATE)
+
+    return _r_function_template
+
+
 def get_r_parameter_name(param: ParamSpec) -> str:
     result = param.name_in_higher_level_interface
     if result == param.name:
@@ -55,6 +264,28 @@ def optional_wrapper_r(conv: str) -> str:
 
 
 class RRCodeGenerator(SingleBlockCodeGenerator):
+    generates_functions_independently = True
+
+    _r_namespaces: Dict[str, Dict[str, Any]]
+
+    def __init__(self):
+        super().__init__()
+        self._r_namespaces = {}
+
+    def _get_r_namespace(self, spec: FunctionDescriptor) -> Dict[str, Any]:
+        """Returns the parsed R-specific part of the specification of the given
+        function. The result is cached until new function descriptors are
+        loaded.
+        """
+        result = self._r_namespaces.get(spec.name)
+        if result is None:
+            result = self._r_namespaces[spec.name] = _parse_r_namespace(spec)
+        return result
+
+    def load_function_descriptors_from_object(self, obj: Dict[str, Any]) -> None:
+        super().load_function_descriptors_from_object(obj)
+        self._r_namespaces.clear()
+
     def generate_function(self, function: str, out: IO[str]) -> None:
         # Check types
         self.check_types_of_function(function)
@@ -65,6 +296,23 @@ class RRCodeGenerator(SingleBlockCodeGenerator):
         # Derive name of R function
         name = spec.get_name_in_generated_code("R")
 
+        # Collect the parameters, their type descriptors and their names in
+        # the R interface only once
+        params = tuple(spec.iter_parameters())
+        type_descs = {
+            param.type: self.get_type_descriptor(param.type) for param in params
+        }
+        r_names = {param.name: get_r_parameter_name(param) for param in params}
+
+        # Partition the parameters into inputs and outputs in a single pass
+        inputs: List[ParamSpec] = []
+        outputs: List[ParamSpec] = []
+        for param in params:
+            if param.is_input:
+                inputs.append(param)
+            if param.is_output:
+                outputs.append(param)
+
         ## Header
         ## do_par handles the translation of a single argument in the
         ## header. Pretty simple, the only difficulty is that we
@@ -89,53 +337,63 @@ class RRCodeGenerator(SingleBlockCodeGenerator):
         ## details, do not generate conversion code for the non-primary
         ## arguments if they are optional
 
-        needs_details_arg = (
-            spec.has_primary_output_parameter and spec.has_non_primary_output_parameter
-        )
-
-        out.write(name)
-        out.write("_impl <- function(")
+        primary_params = [param for param in outputs if param.is_primary]
+        needs_details_arg = bool(primary_params) and len(primary_params) < len(outputs)
 
         def handle_input_argument(param: ParamSpec) -> str:
             tname = param.type
-            type_desc = self.get_type_descriptor(tname)
-            header = name_in_r_interface = get_r_parameter_name(param)
-            if "HEADER" in type_desc:
-                header = type_desc["HEADER"] or ""
+            type_desc = type_descs[tname]
+            name_in_r_interface = r_names[param.name]
+            header = type_desc.get("HEADER", name_in_r_interface)
             if header:
-                header = header.replace("%I%", name_in_r_interface)
+                header, missing = _expand(
+                    header,
+                    name_in_r_interface,
+                    None,
+                    i_deps=param.dependencies,
+                    expand_c=False,
+                )
             else:
-                header = ""
+                header, missing = "", 0
 
             default = param.get_default_value(type_desc) or (
                 "NULL" if param.is_optional and header else ""
             )
             if default:
+                default, missing_in_default = _expand(
+                    default, None, None, i_deps=param.dependencies, expand_c=False
+                )
                 header = f"{header}={default}"
+                missing += missing_in_default
 
-            for i, dep in enumerate(param.dependencies):
-                header = header.replace("%I" + str(i + 1) + "%", dep)
-
-            if re.search("%I[0-9]*%", header):
+            if missing:
                 self.log.error(
                     f"Missing HEADER dependency for {tname} {param.name} in function {function}"
                 )
 
             return header
 
+        reordered_inputs = tuple(spec.iter_input_parameters(reorder=True))
+
         head = [
-            handle_input_argument(param)
-            for param in spec.iter_input_parameters(reorder=True)
-            if not param.is_keyword_only
+            h
+            for h in (
+                handle_input_argument(param)
+                for param in reordered_inputs
+                if not param.is_keyword_only
+            )
+            if h
         ]
-        head = [h for h in head if h != ""]
 
         head2 = [
-            handle_input_argument(param)
-            for param in spec.iter_input_parameters(reorder=True)
-            if param.is_keyword_only
+            h
+            for h in (
+                handle_input_argument(param)
+                for param in reordered_inputs
+                if param.is_keyword_only
+            )
+            if h
         ]
-        head2 = [h for h in head2 if h != ""]
 
         if head2:
             head.append("...")
@@ -156,9 +414,6 @@ class RRCodeGenerator(SingleBlockCodeGenerator):
         if needs_details_arg:
             head.append("details=FALSE")
 
-        out.write(", ".join(head))
-        out.write(") {\n")
-
         ## Argument checks, INCONV
         ##
         ## We take 'IN' and 'INOUT' mode arguments and if they have an
@@ -169,34 +424,37 @@ class RRCodeGenerator(SingleBlockCodeGenerator):
 
         ## The INCONV fields are simply concatenated by newline
         ## characters.
-        out.write("  # Argument checks\n")
 
-        if has_dots_arg:
-            out.write("  check_dots_empty()\n")
+        def expand_conversion(
+            template: str, param: ParamSpec, name: str, kind: str
+        ) -> Tuple[str, int]:
+            # Indent the template, replace its placeholders and report
+            # dependencies that could not be resolved
+            res, missing = _expand(
+                indent(template),
+                name,
+                None,
+                i_deps=param.dependencies,
+                expand_c=False,
+            )
+            if missing:
+                self.log.error(
+                    f"Missing {kind} dependency for {param.type} {param.name} in function {function}"
+                )
+            return res, missing
 
         def handle_argument_check(param: ParamSpec) -> str:
-            tname = param.type
-            t = self.get_type_descriptor(tname)
-            res = t.get_input_conversion_template_for(param.mode)
+            res = type_descs[param.type].get_input_conversion_template_for(param.mode)
+            if not res:
+                return ""
 
-            if param.is_optional and param.is_input and res:
+            if param.is_optional and param.is_input:
                 res = optional_wrapper_r(res)
 
-            # Replace template placeholders
-            res = indent(res).replace("%I%", get_r_parameter_name(param))
-            for i, dep in enumerate(param.dependencies):
-                res = res.replace("%I" + str(i + 1) + "%", dep)
-
-            if re.search("%I[0-9]*%", res):
-                self.log.error(
-                    f"Missing IN dependency for {tname} {param.name} in function {function}"
-                )
-
+            res, _ = expand_conversion(res, param, r_names[param.name], "IN")
             return res
 
-        inconv = [handle_argument_check(param) for param in spec.iter_parameters()]
-        inconv = [i for i in inconv if i != ""]
-        out.write("\n".join(inconv) + "\n\n")
+        inconv = [i for i in (handle_argument_check(param) for param in params) if i]
 
         ## Function call
         ## This is a bit more difficult than INCONV. Here we supply
@@ -208,20 +466,11 @@ class RRCodeGenerator(SingleBlockCodeGenerator):
         ## completely ignored, so giving an empty CALL field is
         ## different than not giving it at all.
 
-        out.write("  on.exit( .Call(R_igraph_finalizer) )\n")
-        out.write("  # Function call\n")
-        out.write("  res <- .Call(R_" + function + ", ")
-
-        parts = []
-        for param in spec.iter_input_parameters():
-            type = self.get_type_descriptor(param.type)
-            name = get_r_parameter_name(param)
-            call = type.get("CALL", name)
-            if call:
-                parts.append(call.replace("%I%", name))
-
-        out.write(", ".join(parts))
-        out.write(")\n")
+        call_args = [
+            call.replace("%I%", r_names[param.name])
+            for param in inputs
+            if (call := type_descs[param.type].get("CALL", r_names[param.name]))
+        ]
 
         ## Output conversions
         def handle_output_argument(
@@ -230,37 +479,37 @@ class RRCodeGenerator(SingleBlockCodeGenerator):
             *,
             iprefix: str = "",
         ):
-            if realname is None:
-                realname = get_r_parameter_name(param)
+            template = type_descs[param.type].get_output_conversion_template_for(
+                param.mode
+            )
+            if not template:
+                return ""
 
-            tname = param.type
-            t = self.get_type_descriptor(tname)
-            outconv = indent(t.get_output_conversion_template_for(param.mode))
-            outconv = outconv.replace("%I%", iprefix + realname)
-            for i, dep in enumerate(param.dependencies):
-                outconv = outconv.replace("%I" + str(i + 1) + "%", dep)
+            if realname is None:
+                realname = r_names[param.name]
 
-            if re.search("%I[0-9]*%", outconv):
-                self.log.error(
-                    f"Missing OUT dependency for {tname} {param.name} in function {function}"
-                )
+            outconv, missing = expand_conversion(
+                template, param, iprefix + realname, "OUT"
+            )
+            if missing:
+                # Drop the unresolved dependency placeholders
+                outconv = _PLACEHOLDER_SUB.sub("", outconv)
 
-            return re.sub("%I[0-9]+%", "", outconv)
+            return outconv
 
-        retpars = [param.name for param in spec.iter_output_parameters()]
+        retpars = [param.name for param in outputs]
 
         if len(retpars) <= 1:
             outconv = [
-                handle_output_argument(param, "res") for param in spec.iter_parameters()
+                o for o in (handle_output_argument(p, "res") for p in params) if o
             ]
         else:
             outconv = [
-                handle_output_argument(param, iprefix="res$")
-                for param in spec.iter_parameters()
+                o
+                for o in (handle_output_argument(p, iprefix="res$") for p in params)
+                if o
             ]
 
-        outconv = [o for o in outconv if o != ""]
-
         if len(retpars) == 0:
             # returning the return value of the function
             rt = self.get_type_descriptor(spec.return_type)
@@ -280,7 +529,6 @@ class RRCodeGenerator(SingleBlockCodeGenerator):
                 # simply return that; otherwise pick the relevant ones from the
                 # result list
                 pick_details = ["if (!details) {"]
-                primary_params = list(spec.iter_primary_output_parameters())
                 if len(primary_params) == 1:
                     primary_param = primary_params[0]
                     pick_details.append(f"  res <- res${primary_param.name}")
@@ -292,74 +540,50 @@ class RRCodeGenerator(SingleBlockCodeGenerator):
             else:
                 # just use the output arguments as they are
                 pass
-        out.write("\n".join(outconv) + "\n")
 
         ## Some graph attributes to add
-        if "R" not in spec:
-            # Convert legacy "GATTR-R", "GATTR-PARAM-R", "CLASS-R" and "PP-R"
-            r_namespace = {}
-            for key in ("GATTR", "GATTR-PARAM", "CLASS", "PP"):
-                r_key = f"{key}-R"
-                if r_key in spec:
-                    r_namespace[key] = spec[r_key]
-            if r_namespace:
-                spec._obj["R"] = r_namespace
-
-        r_spec = spec._obj.get("R", {})
+        r_spec = self._get_r_namespace(spec)
 
         ## Add graph attributes
-        if "GATTR" in r_spec or "GATTR-PARAM" in r_spec:
-            gattrs_dict = {}
-            lines = []
-
-            gattrs = r_spec.get("GATTR")
-            pars = r_spec.get("GATTR-PARAM")
-
-            if isinstance(gattrs, dict):
-                gattrs_dict.update(gattrs)
-            elif gattrs is not None:
-                for item in gattrs.split(","):
-                    name, value = item.split(" IS ", 1)
-                    name = name.strip()
-                    value = value.strip()
-                    gattrs_dict[name] = value
-
-            if gattrs_dict:
-                lines.extend(
-                    f"res${name} <- {val!r}" for name, val in gattrs_dict.items()
-                )
-
-            if pars is not None:
-                if isinstance(pars, str):
-                    pars = pars.split(",")
-                for par in pars:
-                    par = par.strip().replace("_", ".")
-                    lines.append(f"res${par} <- {par}")
-
-            if lines:
-                out.write('  if (igraph_opt("add.params")) {\n')
-                for line in lines:
-                    out.write(indent(indent(line)) + "\n")
-                out.write("  }\n\n")
-
-        ## Set the class if requested
-        if "CLASS" in r_spec:
-            out.write(f'  class(res) <- "{r_spec["CLASS"]}"\n')
-
-        ## See if there is a postprocessor
-        if "PP" in r_spec:
-            out.write(f'  res <- {r_spec["PP"]}(res)\n')
+        lines = [
+            f"res${attr_name} <- {val!r}" for attr_name, val in r_spec["GATTR"].items()
+        ]
+        lines.extend(f"res${par} <- {par}" for par in r_spec["GATTR-PARAM"])
 
-        out.write("  res\n}\n\n")
+        ## Render the function. The template also sets the class and calls the
+        ## postprocessor of the result if the R namespace of the spec asks so
+        out.write(
+            _get_r_function_template().render(
+                name=name,
+                function=function,
+                head=head,
+                has_dots_arg=has_dots_arg,
+                inconv=inconv,
+                call_args=call_args,
+                outconv=outconv,
+                attr_lines=lines,
+                r_spec=r_spec,
+            )
+        )
 
 
 class RCCodeGenerator(SingleBlockCodeGenerator):
+    generates_functions_independently = True
+
     def generate_function(self, function: str, out: IO[str]) -> None:
         # Check types
         self.check_types_of_function(function, errors="error")
 
         desc = self.get_function_descriptor(function)
 
+        # Collect the parameters and the type descriptors of the parameters
+        # and the return value only once
+        params = tuple(desc.iter_parameters())
+        type_descs = {
+            param.type: self.get_type_descriptor(param.type) for param in params
+        }
+        type_descs[desc.return_type] = self.get_type_descriptor(desc.return_type)
+
         ## Compile the output
         ## This code generator is quite difficult, so we use different
         ## functions to generate the approprite chunks and then
@@ -367,58 +591,40 @@ class RCCodeGenerator(SingleBlockCodeGenerator):
         ## See the documentation of each chunk below.
         res = {}
         res["func"] = function
-        res["header"] = self.chunk_header(desc)
-        res["decl"] = self.chunk_declaration(desc)
-        res["inconv"] = self.chunk_inconv(desc)
-        res["call"] = self.chunk_call(desc)
-        res["outconv"] = self.chunk_outconv(desc)
+        res["header"] = self.chunk_header(desc, params, type_descs)
+        res["decl"] = self.chunk_declaration(desc, params, type_descs)
+        res["inconv"] = self.chunk_inconv(desc, params, type_descs)
+        res["call"] = self.chunk_call(desc, params, type_descs)
+        res["outconv"] = self.chunk_outconv(desc, params, type_descs)
 
         # Replace into the template
-        text = (
-            """
-/*-------------------------------------------/
-/ %(func)-42s /
-/-------------------------------------------*/
-%(header)s {
-                                        /* Declarations */
-%(decl)s
-                                        /* Convert input */
-%(inconv)s
-                                        /* Call igraph */
-%(call)s
-                                        /* Convert output */
-%(outconv)s
-
-  UNPROTECT(1);
-  return(r_result);
-}\n"""
-            % res
-        )
-
-        out.write(text)
-
-    def chunk_header(self, desc: FunctionDescriptor) -> str:
+        out.write(_C_FUNCTION_TEMPLATE.format_map(res))
+
+    def chunk_header(
+        self,
+        desc: FunctionDescriptor,
+        params: Sequence[ParamSpec],
+        type_descs: Dict[str, TypeDescriptor],
+    ) -> str:
         """The header. All functions return with a 'SEXP', so this is
         easy. We just take the 'IN' and 'INOUT' arguments, all will
         have type SEXP, and concatenate them by commas. The function name
         is created by prefixing the original name with 'R_'.
         """
-
-        def do_par(spec: ParamSpec) -> str:
-            t = self.get_type_descriptor(spec.type)
-            if "HEADER" in t:
-                if t["HEADER"]:
-                    return t["HEADER"].replace("%I%", spec.name)
-                else:
-                    return ""
-            else:
-                return spec.name
-
-        inout = [do_par(spec) for spec in desc.iter_input_parameters()]
-        inout = ["SEXP " + n for n in inout if n != ""]
-        return "SEXP R_" + desc.name + "(" + (", ".join(inout) or "void") + ")"
-
-    def chunk_declaration(self, desc: FunctionDescriptor) -> str:
+        inout = [
+            f"SEXP {header.replace('%I%', spec.name)}"
+            for spec in params
+            if spec.is_input
+            and (header := type_descs[spec.type].get("HEADER", spec.name))
+        ]
+        return f"SEXP R_{desc.name}({', '.join(inout) or 'void'})"
+
+    def chunk_declaration(
+        self,
+        desc: FunctionDescriptor,
+        params: Sequence[ParamSpec],
+        type_descs: Dict[str, TypeDescriptor],
+    ) -> str:
         """There are a couple of things to declare. First a C type is
         needed for every argument, these will be supplied in the C
         igraph call. Then, all 'OUT' arguments need a SEXP variable as
@@ -430,31 +636,42 @@ class RCCodeGenerator(SingleBlockCodeGenerator):
         """
 
         def do_par(spec: ParamSpec) -> str:
-            type_desc = self.get_type_descriptor(spec.type)
+            type_desc = type_descs[spec.type]
             try:
                 return type_desc.declare_c_variable(f"c_{spec.name}", mode=spec.mode)
             except NoSuchTypeError:
                 return f"/* {spec.name} has no corresponding C type */"
 
-        inout = [do_par(spec) for spec in desc.iter_parameters()]
-        out = [
-            f"SEXP {spec.name};"
-            for spec in desc.iter_parameters()
-            if spec.mode is ParamMode.OUT
-        ]
+        num_retpars = sum(1 for spec in params if spec.is_output)
 
-        retpars = [spec.name for spec in desc.iter_output_parameters()]
+        return_type_desc = type_descs[desc.return_type]
+        retdecl = (
+            return_type_desc.declare_c_variable("c_result") if not num_retpars else ""
+        )
 
-        return_type_desc = self.get_type_descriptor(desc.return_type)
-        retdecl = return_type_desc.declare_c_variable("c_result") if not retpars else ""
+        decls = chain(
+            (do_par(spec) for spec in params),
+            (f"SEXP {spec.name};" for spec in params if spec.mode is ParamMode.OUT),
+            (
+                retdecl,
+                "SEXP r_result;" if num_retpars <= 1 else "SEXP r_result, r_names;",
+            ),
+        )
 
-        if len(retpars) <= 1:
-            res = "\n".join(inout + out + [retdecl] + ["SEXP r_result;"])
-        else:
-            res = "\n".join(inout + out + [retdecl] + ["SEXP r_result, r_names;"])
-        return indent(res)
+        # Same as indent() on the joined declarations but in a single pass and
+        # without the overhead of textwrap.indent()
+        return "\n".join(
+            f"  {line}" if line.strip() else line
+            for decl in decls
+            for line in decl.split("\n")
+        )
 
-    def chunk_inconv(self, desc: FunctionDescriptor) -> str:
+    def chunk_inconv(
+        self,
+        desc: FunctionDescriptor,
+        params: Sequence[ParamSpec],
+        type_descs: Dict[str, TypeDescriptor],
+    ) -> str:
         """Input conversions. Not only for types with mode 'IN' and
         'INOUT', eg. for 'OUT' vector types we need to allocate the
         required memory here, do all the initializations, etc. Types
@@ -463,35 +680,40 @@ class RCCodeGenerator(SingleBlockCodeGenerator):
         """
 
         def do_par(param: ParamSpec) -> str:
-            cname = "c_" + param.name
-            t = self.get_type_descriptor(param.type)
+            t = type_descs[param.type]
 
             # Get the template from the type specification
             inconv = t.get_input_conversion_template_for(param.mode)
+
+            # Resolve the C type even if there is nothing to convert so types
+            # without a C type are reported
             c_type = t.get_c_type(mode=param.mode)
 
-            if not inconv and param.is_input and (t.is_enum or t.is_bitfield):
+            if not inconv:
                 # If the parameter is an input argument and its type is an
                 # enum, we can provide a default conversion: we just cast its
                 # numeric value to the right type
-                if c_type is not None:
-                    inconv = f"%C% = ({c_type}) Rf_asInteger(%I%);"
+                if c_type is None or not (
+                    param.is_input and (t.is_enum or t.is_bitfield)
+                ):
+                    return ""
+                inconv = f"%C% = ({c_type}) Rf_asInteger(%I%);"
 
-            if param.is_optional and param.is_input and inconv:
+            if param.is_optional and param.is_input:
                 inconv = optional_wrapper_c(inconv, c_type)
 
             # Replace the tokens in the type specification
-            for i, dep in enumerate(param.dependencies):
-                inconv = inconv.replace("%C" + str(i + 1) + "%", "c_" + dep)
-
-            return indent(inconv).replace("%C%", cname).replace("%I%", param.name)
-
-        inconv = [do_par(param) for param in desc.iter_parameters()]
-        inconv = [i for i in inconv if i != ""]
+            return _expand_c_conversion(inconv, param)
 
-        return "\n".join(inconv)
+        inconv = (do_par(param) for param in params)
+        return "\n".join(i for i in inconv if i)
 
-    def chunk_call(self, desc: FunctionDescriptor) -> str:
+    def chunk_call(
+        self,
+        desc: FunctionDescriptor,
+        params: Sequence[ParamSpec],
+        type_descs: Dict[str, TypeDescriptor],
+    ) -> str:
         """Every single argument is included, independently of their
         mode. If a type has a 'CALL' field then that is used after the
         usual %C% and %I% substitutions, otherwise the standard 'c_'
@@ -499,14 +721,10 @@ class RCCodeGenerator(SingleBlockCodeGenerator):
         """
 
         calls = []
-        for param in desc.iter_parameters():
-            t = self.get_type_descriptor(param.type)
-            type = t.get("CALL", f"c_{param.name}")
-
-            if isinstance(type, dict):
-                call = type.get(param.mode_str, "")
-            else:
-                call = type
+        for param in params:
+            call = type_descs[param.type].get_call_template_for(param.mode)
+            if call is None:
+                call = f"c_{param.name}"
 
             if call:
                 if (
@@ -516,7 +734,7 @@ class RCCodeGenerator(SingleBlockCodeGenerator):
                     and call != "0"
                 ):
                     call = f"(Rf_isNull(%I%) ? 0 : {call})"
-                call = call.replace("%C%", f"c_{param.name}").replace("%I%", param.name)
+                call, _ = _expand(call, param.name, f"c_{param.name}")
                 calls.append(call)
 
         calls = ", ".join(calls)
@@ -525,7 +743,7 @@ class RCCodeGenerator(SingleBlockCodeGenerator):
         if not desc.return_type:
             res = f"  IGRAPH_R_CHECK({desc.name}({calls}));\n"
         else:
-            return_type = self.get_type_descriptor(desc.return_type)
+            return_type = type_descs[desc.return_type]
             if return_type.name == "ERROR":
                 res = f"  IGRAPH_R_CHECK({desc.name}({calls}));\n"
             elif return_type.name == "VOID":
@@ -535,7 +753,12 @@ class RCCodeGenerator(SingleBlockCodeGenerator):
 
         return res
 
-    def chunk_outconv(self, spec: FunctionDescriptor) -> str:
+    def chunk_outconv(
+        self,
+        spec: FunctionDescriptor,
+        params: Sequence[ParamSpec],
+        type_descs: Dict[str, TypeDescriptor],
+    ) -> str:
         """The output conversions, this is quite difficult. A function
         may report its results in two ways: by returning it directly
         or by setting a variable to which a pointer was passed. igraph
@@ -559,64 +782,89 @@ class RCCodeGenerator(SingleBlockCodeGenerator):
         names.
         """
 
-        def do_par(param: ParamSpec) -> str:
-            cname = f"c_{param.name}"
-            t = self.get_type_descriptor(param.type)
-            outconv = t.get_output_conversion_template_for(param.mode)
-
-            outconv = indent(outconv)
-            for i, dep in enumerate(param.dependencies):
-                outconv = outconv.replace("%C" + str(i + 1) + "%", "c_" + dep)
-
-            return outconv.replace("%C%", cname).replace("%I%", param.name)
-
-        outconv = [do_par(param) for param in spec.iter_parameters()]
-        outconv = [o for o in outconv if o != ""]
+        outconv = [
+            o
+            for o in (
+                _expand_c_conversion(
+                    type_descs[param.type].get_output_conversion_template_for(
+                        param.mode
+                    ),
+                    param,
+                )
+                for param in params
+            )
+            if o
+        ]
 
         # Consider only those parameters that have a corresponding declaration
         # in C.
         retpars = []
-        for param in spec.iter_output_parameters():
-            type_desc = self.get_type_descriptor(param.type)
-            if type_desc.get_c_type(param.mode) is not None:
+        for param in params:
+            type_desc = type_descs[param.type]
+            if param.is_output and type_desc.get_c_type(param.mode) is not None:
                 retpars.append(param)
 
         if not retpars:
             # return the return value of the function
-            rt = self.get_type_descriptor(spec.return_type)
+            rt = type_descs[spec.return_type]
             retconv = indent(rt.get_output_conversion_template_for(ParamMode.OUT))
             retconv = retconv.replace("%C%", "c_result").replace("%I%", "r_result")
             ret = "\n".join(outconv) + "\n" + retconv
         elif len(retpars) == 1:
             # return the single output value
-            retconv = "  r_result = " + retpars[0].name + ";"
+            retconv = f"  r_result = {retpars[0].name};"
             ret = "\n".join(outconv) + "\n" + retconv
         else:
             # create a list of output values
-            sets = [
+            num_retpars = len(retpars)
+            sets = (
                 f"  SET_VECTOR_ELT(r_result, {index}, {param.name});"
                 for index, param in enumerate(retpars)
-            ]
-            names = [
+            )
+            names = (
                 f'  SET_STRING_ELT(r_names, {index}, Rf_mkChar("{param.name_in_higher_level_interface}"));'
                 for index, param in enumerate(retpars)
-            ]
+            )
             ret = "\n".join(
-                [
-                    f"  PROTECT(r_result=NEW_LIST({len(retpars)}));",
-                    f"  PROTECT(r_names=NEW_CHARACTER({len(retpars)}));",
-                ]
-                + outconv
-                + sets
-                + names
-                + ["  SET_NAMES(r_result, r_names);", f"  UNPROTECT({len(sets) + 1});"]
+                chain(
+                    (
+                        f"  PROTECT(r_result=NEW_LIST({num_retpars}));",
+                        f"  PROTECT(r_names=NEW_CHARACTER({num_retpars}));",
+                    ),
+                    outconv,
+                    sets,
+                    names,
+                    (
+                        "  SET_NAMES(r_result, r_names);",
+                        f"  UNPROTECT({num_retpars + 1});",
+                    ),
+                )
             )
 
         return ret
 
 
 class RInitCodeGenerator(BlockBasedCodeGenerator):
+    _argument_counts: Dict[str, Tuple[int, int]]
+    _sorted_functions: Dict[bool, List[str]]
+
+    def __init__(self):
+        super().__init__()
+        self._argument_counts = {}
+        self._sorted_functions = {}
+
     def _count_arguments(self, name: str) -> Tuple[int, int]:
+        """Returns the number of input and output arguments of the function
+        with the given name.
+
+        This function is memoized.
+        """
+        result = self._argument_counts.get(name)
+        if result is None:
+            self._argument_counts[name] = result = self._count_arguments_uncached(name)
+        return result
+
+    def _count_arguments_uncached(self, name: str) -> Tuple[int, int]:
         desc = self.get_function_descriptor(name)
         in_args, out_args = 0, 0
         for param in desc.iter_parameters():
@@ -625,11 +873,7 @@ class RInitCodeGenerator(BlockBasedCodeGenerator):
             except NoSuchTypeError:
                 # param should probably be included in the function header
                 type_spec = None
-            if (
-                type_spec is None
-                or "HEADER" not in type_spec
-                or type_spec.get("HEADER") is not None
-            ):
+            if type_spec is None or type_spec.get("HEADER", "") is not None:
                 if param.is_input:
                     in_args += 1
                 if param.is_output:
@@ -659,4 +903,18 @@ class RInitCodeGenerator(BlockBasedCodeGenerator):
         )
 
     def iter_functions(self, include_ignored: bool = False) -> Iterable[str]:
-        return sorted(super().iter_functions(include_ignored=include_ignored))
+        result = self._sorted_functions.get(include_ignored)
+        if result is None:
+            self._sorted_functions[include_ignored] = result = sorted(
+                super().iter_functions(include_ignored=include_ignored)
+            )
+        return result
+
+    def load_function_descriptors_from_object(self, obj: Dict[str, Any]) -> None:
+        super().load_function_descriptors_from_object(obj)
+        self._argument_counts.clear()
+        self._sorted_functions.clear()
+
+    def load_type_descriptors_from_object(self, obj: Dict[str, Any]) -> None:
+        super().load_type_descriptors_from_object(obj)
+        self._argument_counts.clear()
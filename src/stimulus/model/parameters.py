@@ -17,13 +17,23 @@ class ParamMode(Enum):
     OUT = "out"
     INOUT = "inout"
 
-    @property
-    def is_input(self) -> bool:
-        return self is self.__class__.IN or self is self.__class__.INOUT
+    spec_key: str
+    """Key of the mode in the mode-dependent sections of type and function
+    specifications (e.g. ``IN`` or ``INOUT``).
+    """
 
-    @property
-    def is_output(self) -> bool:
-        return self is self.__class__.OUT or self is self.__class__.INOUT
+    is_input: bool
+    """Whether parameters with this mode are input arguments."""
+
+    is_output: bool
+    """Whether parameters with this mode are output arguments."""
+
+    def __init__(self, value: str):
+        # These are queried for every parameter in every code generator so
+        # they are computed once instead of being properties
+        self.spec_key = value.upper()
+        self.is_input = value in ("in", "inout")
+        self.is_output = value in ("out", "inout")
 
 
 class DefaultValueType(Enum):
@@ -195,16 +205,16 @@ class ParamSpec:
     @property
     def is_input(self) -> bool:
         """Returns whether the function parameter is an input argument."""
-        return self.mode in (ParamMode.IN, ParamMode.INOUT)
+        return self.mode.is_input
 
     @property
     def is_output(self) -> bool:
         """Returns whether the function parameter is an output argument."""
-        return self.mode in (ParamMode.OUT, ParamMode.INOUT)
+        return self.mode.is_output
 
     @property
     def mode_str(self) -> str:
-        return str(self.mode.value).upper()
+        return self.mode.spec_key
 
     @property
     def name_in_higher_level_interface(self) -> str:
@@ -1,6 +1,6 @@
 from dataclasses import dataclass, field
 from deepmerge import always_merger
-from typing import Any, Dict, Mapping, Optional, Set
+from typing import Any, Dict, Mapping, Optional, Set, Tuple
 
 from stimulus.errors import NoSuchTypeError
 
@@ -25,6 +25,26 @@ class TypeDescriptor(Mapping[str, Any], DescriptorMixin):
 
     _obj: Dict[str, str] = field(default_factory=dict)
 
+    _c_types: Dict[ParamMode, Optional[str]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    """Cache of the C types resolved from the ``CTYPE`` key, keyed by mode"""
+
+    _conversions: Dict[Tuple[str, ParamMode], Optional[str]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    """Cache of the conversion templates resolved from the ``INCONV`` and
+    ``OUTCONV`` keys, keyed by the name of the key and the mode
+    """
+
+    _calls: Dict[ParamMode, Optional[str]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    """Cache of the call templates resolved from the ``CALL`` key, keyed by mode"""
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._obj
+
     def __getitem__(self, key: str) -> Any:
         return self._obj[key]
 
@@ -34,6 +54,9 @@ class TypeDescriptor(Mapping[str, Any], DescriptorMixin):
     def __len__(self):
         return len(self._obj)
 
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._obj.get(key, default)
+
     def declare_c_function_argument(
         self, name: Optional[str] = None, *, mode: ParamMode = ParamMode.OUT
     ) -> str:
@@ -95,7 +118,7 @@ class TypeDescriptor(Mapping[str, Any], DescriptorMixin):
         Returns:
             a C variable declaration, without indentation or trailing newline
         """
-        mode_str = str(mode.value).upper()
+        mode_str = mode.spec_key
         c_decl = self._obj.get("CDECL")
         if isinstance(c_decl, dict):
             c_decl = c_decl.get(mode_str)
@@ -125,7 +148,16 @@ class TypeDescriptor(Mapping[str, Any], DescriptorMixin):
                 not state explicitly that the abstract type does _not_ have
                 a corresponding C type either)
         """
-        mode_str = str(mode.value).upper()
+        try:
+            return self._c_types[mode]
+        except KeyError:
+            pass
+
+        result = self._c_types[mode] = self._resolve_c_type(mode)
+        return result
+
+    def _resolve_c_type(self, mode: ParamMode) -> Optional[str]:
+        mode_str = mode.spec_key
         c_type = self._obj.get("CTYPE", _MISSING)
         if c_type is _MISSING:
             raise NoSuchTypeError(
@@ -152,6 +184,32 @@ class TypeDescriptor(Mapping[str, Any], DescriptorMixin):
                 f"CTYPE declaration must be a string or a mapping, got {type(c_type)}"
             )
 
+    def get_call_template_for(self, mode: ParamMode) -> Optional[str]:
+        """Returns a template string that specifies how parameters of this type
+        should be passed to the C function in the given mode.
+
+        Returns:
+            the template, an empty string if parameters of this type should be
+            omitted from the call in the given mode, or `None` if the type
+            does not specify a ``CALL`` template at all
+        """
+        try:
+            return self._calls[mode]
+        except KeyError:
+            pass
+
+        call = self._obj.get("CALL", _MISSING)
+        if call is _MISSING:
+            call = None
+        elif isinstance(call, dict):
+            call = call.get(mode.spec_key) or ""
+        elif call is None:
+            # An explicit null omits the argument from the call
+            call = ""
+
+        self._calls[mode] = call
+        return call
+
     def get_input_conversion_template_for(
         self, mode: ParamMode, *, default: str = ""
     ) -> str:
@@ -163,26 +221,8 @@ class TypeDescriptor(Mapping[str, Any], DescriptorMixin):
         `INOUT` mode, it is assumed to be identical to the code snippet for
         the `IN` mode.
         """
-        if "INCONV" in self:
-            inconv = self["INCONV"]
-            if isinstance(inconv, str):
-                return inconv if mode.is_input else default
-            elif isinstance(inconv, dict):
-                try:
-                    return inconv[mode.value.upper()] or default
-                except KeyError:
-                    if mode is ParamMode.INOUT:
-                        return self.get_input_conversion_template_for(
-                            ParamMode.IN, default=default
-                        )
-                    else:
-                        return default
-            else:
-                raise TypeError(
-                    f"INCONV should be a string or a dict for type {self.name}"
-                )
-        else:
-            return default
+        result = self._get_conversion_template("INCONV", mode, ParamMode.IN)
+        return default if result is None else result
 
     def get_output_conversion_template_for(
         self, mode: ParamMode, *, default: str = ""
@@ -195,26 +235,8 @@ class TypeDescriptor(Mapping[str, Any], DescriptorMixin):
         `INOUT` mode, it is assumed to be identical to the code snippet for
         the `OUT` mode.
         """
-        if "OUTCONV" in self:
-            outconv = self["OUTCONV"]
-            if isinstance(outconv, str):
-                return outconv if mode.is_output else default
-            elif isinstance(outconv, dict):
-                try:
-                    return outconv[mode.value.upper()] or default
-                except KeyError:
-                    if mode is ParamMode.INOUT:
-                        return self.get_output_conversion_template_for(
-                            ParamMode.OUT, default=default
-                        )
-                    else:
-                        return default
-            else:
-                raise TypeError(
-                    f"OUTCONV should be a string or a dict for type {self.name}"
-                )
-        else:
-            return default
+        result = self._get_conversion_template("OUTCONV", mode, ParamMode.OUT)
+        return default if result is None else result
 
     def has_flag(self, flag: str) -> bool:
         """Checks whether the type descriptor has the given flag, in a
@@ -249,6 +271,50 @@ class TypeDescriptor(Mapping[str, Any], DescriptorMixin):
         else:
             return str(value)
 
+    def _get_conversion_template(
+        self, key: str, mode: ParamMode, fallback_mode: ParamMode
+    ) -> Optional[str]:
+        """Returns the conversion template stored under the given key for the
+        given mode, or `None` if there is no such template and the default
+        template of the caller should be used.
+
+        An explicit string template is returned as is, even if it is empty.
+        Empty templates in a mode-dependent mapping count as missing.
+
+        `fallback_mode` is the mode whose template is used in `INOUT` mode if
+        the conversion code snippets depend on the mode but there is no
+        snippet for `INOUT`. The same mode is also the one that a
+        mode-independent snippet applies to, in addition to `INOUT`.
+        """
+        cache_key = (key, mode)
+        try:
+            return self._conversions[cache_key]
+        except KeyError:
+            pass
+
+        conv = self._obj.get(key, _MISSING)
+        result: Optional[str]
+        if conv is _MISSING:
+            result = None
+        elif isinstance(conv, str):
+            applies = mode is fallback_mode or mode is ParamMode.INOUT
+            result = conv if applies else None
+        elif isinstance(conv, dict):
+            try:
+                result = conv[mode.spec_key] or None
+            except KeyError:
+                if mode is ParamMode.INOUT:
+                    result = self._get_conversion_template(
+                        key, fallback_mode, fallback_mode
+                    )
+                else:
+                    result = None
+        else:
+            raise TypeError(f"{key} should be a string or a dict for type {self.name}")
+
+        self._conversions[cache_key] = result
+        return result
+
     def update_from(self, obj: Dict[str, str]) -> None:
         """Updates the type descriptor from an object typically parsed from
         a specification file.
@@ -262,6 +328,9 @@ class TypeDescriptor(Mapping[str, Any], DescriptorMixin):
           - Any other key in `obj` is merged with the existing key-value store.
         """
         always_merger.merge(self._obj, obj)
+        self._c_types.clear()
+        self._conversions.clear()
+        self._calls.clear()
 
         it = self._parse_as_comma_separated_list("FLAGS")
         self.flags |= {flag.lower() for flag in it}